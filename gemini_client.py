@@ -0,0 +1,84 @@
+import streamlit as st
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Shared by every page, so the model, RPM limiter and concurrency cap are process-wide
+MODEL_NAME = "gemini-2.5-flash"
+GEMINI_MAX_CONCURRENCY = 4  # in-flight generate_content calls per server process
+GEMINI_RPM_LIMIT = 10  # requests per minute (gemini-2.5-flash free tier)
+GEMINI_SLOT_WAIT_SECONDS = 60.0  # longest a call waits for an RPM slot before failing (retryable from the card)
+GEMINI_FOREGROUND_WAIT_SECONDS = 5.0  # same, for calls made on the script thread while the UI waits
+
+@st.cache_resource
+def get_gemini_model(name: str = MODEL_NAME):
+    # Deferred so reruns that never call Gemini skip the SDK import and configure
+    import google.generativeai as genai
+    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+    return genai.GenerativeModel(name)
+
+@st.cache_resource
+def get_gemini_semaphore():
+    # Bounds concurrent Gemini calls across sessions and background work
+    return threading.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+class RateLimiter:
+    """
+    Sliding-window limiter shared by every Gemini call in the process: wait()
+    blocks until fewer than 'limit' calls were started in the last 'period' seconds,
+    or returns False without taking a slot if that would take longer than 'timeout'.
+    """
+    def __init__(self, limit: int, period: float = 60.0):
+        self.limit = limit
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def wait(self, timeout: float = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.limit:
+                    self._calls.append(now)
+                    return True
+                delay = self.period - (now - self._calls[0])
+            if deadline is not None and now + delay > deadline:
+                return False
+            time.sleep(delay)
+
+@st.cache_resource
+def get_gemini_rate_limiter():
+    return RateLimiter(GEMINI_RPM_LIMIT)
+
+@contextmanager
+def gemini_slot(timeout: float = GEMINI_SLOT_WAIT_SECONDS):
+    """
+    Takes an RPM slot and a concurrency slot for one Gemini call, held until
+    the block exits (so a streamed response counts until fully read). Raises
+    RuntimeError if no RPM slot frees up within 'timeout' seconds.
+    """
+    if not get_gemini_rate_limiter().wait(timeout=timeout):
+        raise RuntimeError(f"more than {GEMINI_RPM_LIMIT} Gemini requests per minute; try again shortly")
+    with get_gemini_semaphore():
+        yield get_gemini_model()
+
+def gemini_generate(prompt: str, *, slot_timeout: float = GEMINI_SLOT_WAIT_SECONDS, retry_timeout: float = 20.0, **kwargs):
+    """
+    Calls generate_content on the shared model behind the RPM limiter and the
+    concurrency cap. 503s are retried briefly with exponential backoff; a 429
+    fails immediately, since retrying it would bypass the limiter and, once the
+    daily quota is gone, only hold a worker until the retry deadline.
+    Foreground callers pass short 'slot_timeout'/'retry_timeout' so the UI fails fast.
+    """
+    from google.api_core import exceptions, retry
+
+    backoff = retry.Retry(
+        predicate=retry.if_exception_type(exceptions.ServiceUnavailable),
+        initial=1.0, multiplier=2.0, maximum=8.0, timeout=retry_timeout,
+    )
+    with gemini_slot(slot_timeout) as model:
+        return model.generate_content(prompt, request_options={"retry": backoff}, **kwargs)
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-import google.generativeai as genai
+
+from gemini_client import GEMINI_FOREGROUND_WAIT_SECONDS, gemini_slot
       
 #SETUP / Config
 st.set_page_config(page_title="Assistant AI", page_icon="💬", layout="wide")
@@ -11,60 +12,30 @@ st.markdown(
         unsafe_allow_html=True)
 
 try:
-    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    MODEL_NAME = "gemini-2.5-flash"
+    # Check if the API key is set; the shared client in gemini_client configures itself lazily
+    if not st.secrets.get("GEMINI_API_KEY"):
+        st.error("GEMINI_API_KEY not found in secrets.")
+        st.stop()
 except Exception as e:
     st.error(f"Error configuring Gemini AI: {e}")
     st.stop()
 
-st.markdown("""
-<style>
-    /* HIDE STREAMLIT'S DEFAULT NAVIGATION */
-    [data-testid="stSidebar"] { display: none; }
-    [data-testid="stPageLink"] { display: none; } 
-    
-    /* Push content to the top */
-    .block-container { padding-top: 1rem !important; }
-    
-    /* Remove custom nav button styling as we now use st.navigation */
-    .nav-container { display: none; } 
-
-    /* Main Theme */
-    body { background-color: #FFFFFF; color: #333333; }
-    h1 { color: #000000; text-align: center; }
-    
-    /* Styling for the input box */
-    .stTextInput>div>div>input { 
-        color: #000000 !important; 
-        background-color: #F0F2F6 !important; 
-        border: 1px solid #CCCCCC !important; 
-        border-radius: 8px; 
-        padding: 14px;
-    }
-    
-    /* Purple links/text */
-    a { color: #6A1B9A; text-decoration: none; font-weight: bold; }
-    a:hover { text-decoration: underline; }
-    
-    /* Style for the centered header text (to make 608 bold) */
-    .centered-header-text strong {
-        color: #6A1B9A;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Stylesheet lives in static/assistant.css (served via enableStaticServing)
+st.markdown('<link rel="stylesheet" href="app/static/assistant.css">', unsafe_allow_html=True)
 
 # helper
-@st.cache_data
+# cache_resource hands every caller the same frame (no per-rerun copy); treat it as read-only
+@st.cache_resource
 def load_data(file_path):
     try:
-        return pd.read_csv("SB_publication_PMC.csv", usecols=['Title', 'Link']) 
+        return pd.read_csv("SB_publication_PMC.csv", usecols=['Title', 'Link'], dtype={'Title': 'string[pyarrow]', 'Link': 'string[pyarrow]'}) 
     except (FileNotFoundError, ValueError):
         st.error("Error: Could not load the publication data file (SB_publication_PMC.csv).")
         st.stop()
 
 def find_relevant_publications(query, df, top_k=5):
     if query:
-        mask = df["Title"].astype(str).str.lower().str.contains(query.lower(), na=False)
+        mask = df["Title"].str.contains(query, case=False, regex=False, na=False)
         return df[mask].head(top_k)
     return pd.DataFrame()
 
@@ -118,13 +89,25 @@ with col2:
                         f"--- USER'S QUESTION ---\n{prompt}"
                     )
 
-                try:
-                    model = genai.GenerativeModel(MODEL_NAME)
-                    response = model.generate_content(full_prompt)
-                    ai_response = response.text
-                except Exception as e:
-                    ai_response = f"Sorry, an error occurred with the AI service: {e}"
-                
-                placeholder.markdown(ai_response)
+            # Stream the answer so text appears as soon as the first chunk arrives; the
+            # slot counts the chat against the same RPM/concurrency budget as summaries
+            parts = []
+            try:
+                with gemini_slot(GEMINI_FOREGROUND_WAIT_SECONDS) as model:
+                    for chunk in model.generate_content(full_prompt, stream=True):
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            # Chunk without text parts (e.g. an empty final chunk or a safety stop)
+                            continue
+                        parts.append(text)
+                        placeholder.markdown("".join(parts) + "▌")
+                # Every chunk can lack text (e.g. a safety stop) without raising
+                ai_response = "".join(parts) or "Sorry, the AI service returned no answer for this question."
+            except Exception as e:
+                # Keep whatever already streamed; only report the error if nothing arrived
+                ai_response = "".join(parts) or f"Sorry, an error occurred with the AI service: {e}"
+
+            placeholder.markdown(ai_response)
         
         st.session_state.messages.append({"role": "assistant", "content": ai_response})
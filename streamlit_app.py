@@ -1,26 +1,60 @@
 import streamlit as st
-import json
-import io
-import time
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+import orjson
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import PyPDF2
-from functools import lru_cache
-from streamlit_extras.let_it_rain import rain
-from streamlit_extras.mention import mention
-import google.generativeai as genai
 
-MODEL_NAME = "gemini-2.5-flash"
+from gemini_client import (
+    GEMINI_FOREGROUND_WAIT_SECONDS,
+    GEMINI_MAX_CONCURRENCY,
+    gemini_generate,
+    get_gemini_model,
+    get_gemini_semaphore,
+)
+
+MAX_INPUT_CHARS = 25000  # cap on document text sent to Gemini per summary (HTML and PDF)
+MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024  # refuse to buffer larger responses
+MAX_SESSION_SUMMARIES = 64  # summaries (or pending futures) kept per session, least recently used evicted first
+PREWARM_COUNT = 5  # publications summarized in the background at startup; kept under gemini_client.GEMINI_RPM_LIMIT
+MAX_HTML_PARSE_BYTES = 500_000  # HTML beyond this cannot contribute to the 25k-char output
+SUMMARY_POLL_SECONDS = 1.0  # longest the script waits on background summaries before redrawing
+RESULTS_PAGE_SIZE = 20  # result cards rendered per page
+PREFETCH_COUNT = 10  # top search results whose pages are fetched ahead of a click
+PREFETCH_CONCURRENCY = 3  # speculative fetches running at once, so clicks keep executor workers
+MAX_PREFETCHED_URLS = 1024  # prefetched URLs remembered per process, oldest forgotten first
+MAX_INPUT_TOKENS = 8000  # per summary; English prose stays under it, denser scripts get trimmed
+
+# A "References"/"Bibliography" heading on its own line and everything after it
+REFERENCES_HEADING_RE = re.compile(r"\n\s*(?:references|bibliography)\s*\n.*", re.IGNORECASE | re.DOTALL)
+
+# Static prompt text, built once at import rather than per call
+SUMMARIZE_PROMPT_PREFIX = (
+    "Summarize this NASA bioscience paper. Output in clean Markdown with a level 3 heading (###) titled 'Key Findings' "
+    "(using bullet points) and a level 3 heading (###) titled 'Overview Summary' (using a paragraph).\n\nContent:\n"
+)
+TRUNCATED_PROMPT_NOTE = (
+    "Note: the content was cut off at the input limit, so it covers only the beginning of the paper. "
+    "Summarize what is present and do not guess at the missing sections.\n\n"
+)
+# Appended by the extractors when they stopped before the end of the document. Extracted
+# text has its whitespace collapsed, so a newline can only come from this marker.
+TRUNCATED_MARKER = "\n[truncated]"
+TRANSLATE_PROMPT_RULES = (
+    'Return ONLY a JSON object of the form {"ui": {...}, "cols": [...]} with the same keys '
+    "and the same list order as the input (no commentary).\n"
+)
 
 # --- INITIAL SETUP & CONFIGURATION ---
 st.set_page_config(page_title="Simplified Knowledge", layout="wide")
 
 try:
-    # Check if the API key is set before configuring
-    if st.secrets.get("GEMINI_API_KEY"):
-        genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    else:
+    # Check if the API key is set; the client itself is configured lazily in get_gemini_model()
+    if not st.secrets.get("GEMINI_API_KEY"):
         st.error("GEMINI_API_KEY not found in secrets.")
         st.stop()
 except Exception as e:
@@ -29,7 +63,8 @@ except Exception as e:
 
 # --- INITIALIZE SESSION STATE ---
 if 'summary_dict' not in st.session_state:
-    st.session_state.summary_dict = {}
+    # Bounded LRU; always write through store_summary()
+    st.session_state.summary_dict = OrderedDict()
 
 # UI strings in English (from the block you supplied)
 UI_STRINGS_EN = {
@@ -48,19 +83,26 @@ UI_STRINGS_EN = {
     "search_label": "Search publications...",
     "results_header": "Found {count} matching publications:",
     "no_results": "No matching publications found.",
-    "summarize_button": "🔬 Gather & Summarize"
+    "summarize_button": "🔬 Gather & Summarize",
+    "summarize_all_button": "🔬 Summarize all on this page",
+    "page_label": "Page"
 }
 
+# Columns read from the publications CSV (see load_data)
+DATASET_COLUMNS = ("Title", "Link")
+
 if 'current_lang' not in st.session_state:
     st.session_state.current_lang = "English"  # Default language
 if 'translations' not in st.session_state:
-    st.session_state.translations = {"English": UI_STRINGS_EN.copy()}
+    # English is shared by identity; the table is read-only so no per-session copy
+    st.session_state.translations = {"English": UI_STRINGS_EN}
 if 'translated_strings' not in st.session_state:
     st.session_state.translated_strings = st.session_state.translations["English"]
 
 # --- CLEANED LANGUAGES DICT (only touch related to translation feature) ---
 # Note: replaced the problematic duplicate entries with a consistent mapping.
-LANGUAGES = {
+# Read-only view so the shared table cannot be mutated by accident.
+LANGUAGES = MappingProxyType({
     "العربية": {"label": "العربية (Arabic)", "code": "ar"},
     "বাংলা": {"label": "বাংলা (Bengali)", "code": "bn"},
     "Čeština": {"label": "Čeština (Czech)", "code": "cs"},
@@ -114,80 +156,75 @@ LANGUAGES = {
     "မြန်မာစာ": {"label": "မြန်မာစာ (Burmese)", "code": "my"},
     "ਪੰਜਾਬੀ": {"label": "ਪੰਜਾਬੀ (Punjabi)", "code": "pa"},
     "Српски": {"label": "Српски (Serbian)", "code": "sr"},
-}
+})
+# Selectbox options, built once per run instead of per lookup
+_LANG_OPTIONS = tuple(LANGUAGES)
 
 
 # ----------------- TRANSLATION HELPERS -----------------
 def extract_json_from_text(text: str):
-    start = text.find('{')
-    end = text.rfind('}')
+    t = text.strip()
+    # Drop a ```json ... ``` fence if the model added one
+    if t.startswith("```"):
+        t = t.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    # Fast path: the prompt asks for bare JSON, which is the usual reply
+    try:
+        return orjson.loads(t)
+    except orjson.JSONDecodeError:
+        pass
+    start = t.find('{')
+    end = t.rfind('}')
     if start == -1 or end == -1:
         raise ValueError("No JSON object found in model output.")
-    return json.loads(text[start:end+1])
-
-def translate_dict_via_gemini(source_dict: dict, target_lang_name: str):
-    """
-    Calls Gemini to translate the VALUES of a JSON object and returns a dict
-    with the same keys and translated values. If Gemini fails, raises an exception
-    which will be handled by the caller.
-    """
-    try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        prompt = (
-            f"Translate the VALUES of the following JSON object into {target_lang_name}.\n"
-            "Return ONLY a JSON object with the same keys and translated values (no commentary).\n"
-            f"Input JSON:\n{json.dumps(source_dict, ensure_ascii=False)}\n"
-        )
-        resp = model.generate_content(prompt)
-        return extract_json_from_text(resp.text)
-    except Exception as e:
-        # Reraise to be handled by outer logic so we can fallback gracefully.
-        raise
+    return orjson.loads(t[start:end+1])
 
-def translate_list_via_gemini(items: list, target_lang_name: str):
+@st.cache_data(persist="disk", show_spinner=False)
+def translate_bundle_via_gemini(ui_items: tuple, columns: tuple, target_lang_name: str):
     """
-    Calls Gemini to translate a list of short strings and returns a list of translated strings.
-    If Gemini fails, raises an exception for the caller to handle.
+    Calls Gemini once to translate both the UI string VALUES and the dataset
+    column names. Inputs are tuples (ui_items as (key, value) pairs) so the
+    result can be cached on disk per language. Returns (ui_dict, column_list).
+    If Gemini fails, raises an exception for the caller to handle; failures
+    are never cached.
     """
-    try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        prompt = (
-            f"Translate this list of short strings into {target_lang_name}. "
-            f"Return a JSON array of translated strings in the same order.\n"
-            f"Input: {json.dumps(items, ensure_ascii=False)}\n"
-        )
-        resp = model.generate_content(prompt)
-        start = resp.text.find('[')
-        end = resp.text.rfind(']')
-        if start == -1 or end == -1:
-            raise ValueError("No JSON array found in model output.")
-        return json.loads(resp.text[start:end+1])
-    except Exception as e:
-        # Reraise so caller can fallback
-        raise
+    payload = {"ui": dict(ui_items), "cols": list(columns)}
+    prompt = (
+        f"Translate the string values of the following JSON object into {target_lang_name}.\n"
+        f"{TRANSLATE_PROMPT_RULES}"
+        f"Input JSON:\n{orjson.dumps(payload).decode()}\n"
+    )
+    # JSON mode makes the reply parse on extract_json_from_text's fast path. Runs on the
+    # script thread, so it gives up quickly (falling back to English) rather than freeze the UI.
+    resp = gemini_generate(
+        prompt,
+        slot_timeout=GEMINI_FOREGROUND_WAIT_SECONDS,
+        retry_timeout=GEMINI_FOREGROUND_WAIT_SECONDS,
+        generation_config={"response_mime_type": "application/json"},
+    )
+    result = extract_json_from_text(resp.text)
+    ui, cols = result["ui"], result["cols"]
+    if set(ui) != set(payload["ui"]) or len(cols) != len(columns):
+        raise ValueError("Model output does not match the input keys/columns.")
+    return ui, cols
 
 def perform_translation(lang_choice: str):
     """
     Centralized function to translate UI strings into 'lang_choice'.
-    Shows emoji rain and spinner for ~6 seconds, attempts Gemini translation,
-    and falls back to English if anything fails.
+    Shows emoji rain and a spinner while Gemini translates, and falls back to
+    English if anything fails; the failed language is recorded so later reruns
+    don't retry it until the selection changes.
     """
-    # If already the same language, just return current strings
-    if lang_choice == st.session_state.current_lang and lang_choice in st.session_state.translations:
-        st.session_state.translated_strings = st.session_state.translations[lang_choice]
-        return st.session_state.translated_strings
-
-    # visual animation and spinner (approx 6 seconds)
+    # visual feedback runs client-side; the server does not wait on it
+    from streamlit_extras.let_it_rain import rain
     rain(emoji="⏳", font_size=54, falling_speed=5, animation_length=2)
     with st.spinner(f"Translating UI to {lang_choice}..."):
-        # ensure the spinner + animation last long enough
-        start_t = time.time()
         try:
             if lang_choice in st.session_state.translations:
                 translated_strings = st.session_state.translations[lang_choice]
             else:
                 # Attempt to call Gemini to translate the known English UI strings
-                translated_strings = translate_dict_via_gemini(st.session_state.translations["English"], lang_choice)
+                # Column names ride along so the dataset view hits the same cache entry
+                translated_strings, _ = translate_bundle_via_gemini(tuple(UI_STRINGS_EN.items()), DATASET_COLUMNS, lang_choice)
                 st.session_state.translations[lang_choice] = translated_strings
 
             st.session_state.current_lang = lang_choice
@@ -196,126 +233,15 @@ def perform_translation(lang_choice: str):
             # If anything fails, fallback to English and show warning
             st.warning(f"Translation failed — using English. ({str(e)})")
             st.session_state.current_lang = "English"
-            st.session_state.translated_strings = st.session_state.translations["English"]
-
-        # Guarantee ~6 seconds total for UX (if translation was very fast)
-        elapsed = time.time() - start_t
-        if elapsed < 6:
-            time.sleep(6 - elapsed)
+            st.session_state.translated_strings = UI_STRINGS_EN
+            st.session_state.failed_lang = lang_choice
 
     return st.session_state.translated_strings
 
-# ----------------- STYLING (unchanged) -----------------
-st.markdown("""
-    <style>
-    /* Custom Nav button container for the top-left */
-    .nav-container-ai {
-        display: flex;
-        justify-content: flex-start;
-        padding-top: 3rem; 
-        padding-bottom: 0rem;
-    }
-    .nav-button-ai a {
-        background-color: #6A1B9A; /* Purple color */
-        color: white; 
-        padding: 10px 20px;
-        border-radius: 8px; 
-        text-decoration: none; 
-        font-weight: bold;
-        transition: background-color 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-    }
-    .nav-button-ai a:hover { 
-        background-color: #4F0A7B; /* Darker purple on hover */
-    }
-    /* HIDE STREAMLIT'S DEFAULT NAVIGATION (Sidebar hamburger menu) */
-    [data-testid="stSidebar"] { display: none; }
-    
-    /* Push content to the top */
-    .block-container { padding-top: 1rem !important; }
-    
-    /* Ensure no residual custom nav container is active */
-    .nav-container { display: none; } 
-
-    /* Main Theme */
-    h1, h3 { text-align: center; }
-    h1 { font-size: 4.5em !important; padding-bottom: 0.5rem; color: #000000; }
-    h3 { color: #333333; }
-    input[type="text"] {
-        color: #000000 !important; background-color: #F0F2F6 !important;
-        border: 1px solid #CCCCCC !important; border-radius: 8px; padding: 14px;
-    }
-    
-    /* Result Card Styling (Full-Width) */
-    .result-card {
-        background-color: #FAFAFA; 
-        padding: 1.5rem; 
-        border-radius: 10px;
-        margin-bottom: 1.5rem; /* More space between cards for UX */
-        border: 1px solid #E0E0E0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
-    
-    /* Title Styling */
-    .result-card .stMarkdown strong { 
-        font-size: 1.15em; 
-        display: block;
-        margin-bottom: 10px; 
-    }
-
-    /* Consistent Purple Link Color */
-    a { color: #6A1B9A; text-decoration: none; font-weight: bold; }
-    a:hover { text-decoration: underline; }
-    
-    /* Summary Container (The inner block for summary text) */
-    .summary-display {
-        margin-top: 1rem;
-        padding-top: 1rem;
-        border-top: 1px dashed #CCC;
-    }
-    <style>
-/* ABSOLUTE POSITIONING */
-.language-dropdown-column {
-    position: absolute;
-    top: 30px; 
-    right: 20px; 
-    z-index: 100;
-    width: 220px; /* Slightly expanded to fit labels */
-}
-
-/* STYLING (White/Light Purple) */
-.language-dropdown-column .stSelectbox {
-    background-color: white; 
-    border-radius: 8px;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.1); 
-    border: 1px solid #C5B3FF; 
-}
-
-.language-dropdown-column label {
-    display: none !important; 
-}
-
-.language-dropdown-column .stSelectbox .st-bd { 
-    background-color: #F8F7FF; 
-    color: #4F2083; 
-    border: none;
-    border-radius: 8px;
-    padding: 6px 10px; /* Reduced padding */
-    font-size: 14px; /* Reduced font size */
-    font-weight: 600;
-}
-
-.language-dropdown-column .stSelectbox .st-bd:hover {
-    background-color: #E6E0FF; 
-}
-
-.language-dropdown-column .stSelectbox [data-testid="stTriangle"] {
-    color: #6A1B9A; 
-}
-
-[data-testid="stSidebar"] { display: none; }
-</style>
-""", unsafe_allow_html=True)
+# ----------------- STYLING -----------------
+# Stylesheet lives in static/app.css (served via enableStaticServing) so the
+# browser fetches and caches it once instead of receiving it on every rerun
+st.markdown('<link rel="stylesheet" href="app/static/app.css">', unsafe_allow_html=True)
 
 # ----------------- TOP-RIGHT LANGUAGE SELECTOR (replaces earlier partial code) -----------------
 _, col_language = st.columns([10, 1])
@@ -324,21 +250,24 @@ with col_language:
     # Show label text via LANGUAGES mapping
     # Use keys of LANGUAGES as options and format_func to show label
     try:
-        index_default = list(LANGUAGES.keys()).index(st.session_state.current_lang)
+        index_default = _LANG_OPTIONS.index(st.session_state.current_lang)
     except ValueError:
         index_default = 0
 
     lang_choice = st.selectbox(
         "L",  # minimal label hidden via CSS
-        options=list(LANGUAGES.keys()),
+        options=_LANG_OPTIONS,
         index=index_default,
         format_func=lambda x: LANGUAGES[x]["label"] if isinstance(LANGUAGES.get(x), dict) else str(x),
         key="language_selector",
+        # A new selection gets a fresh attempt even if the previous one failed
+        on_change=lambda: st.session_state.pop("failed_lang", None),
     )
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Apply translation if needed (top selector)
-perform_translation(lang_choice)
+# Apply translation only when the selection actually changed and hasn't just failed
+if lang_choice != st.session_state.current_lang and lang_choice != st.session_state.get("failed_lang"):
+    perform_translation(lang_choice)
 selected_language_code = LANGUAGES.get(st.session_state.current_lang, {}).get("code", "")
 
 # --- Demonstration of Use (Main Content) ---
@@ -348,10 +277,15 @@ st.info(f"Language Selector Status: **{st.session_state.current_lang}** (Code: *
 
 
 # --- HELPER FUNCTIONS (Copied from original, unchanged) ---
-@st.cache_data
+# cache_resource hands every caller the same frame (no per-rerun copy); treat it as read-only
+@st.cache_resource
 def load_data(file_path):
     try:
-        return pd.read_csv(file_path)
+        # Only Title/Link are ever used; Arrow-backed strings get native substring kernels
+        df = pd.read_csv(file_path, usecols=list(DATASET_COLUMNS), dtype=dict.fromkeys(DATASET_COLUMNS, "string[pyarrow]"), engine="c")
+        # Lowercased titles for search, built once per load instead of on every keystroke
+        df["_title_lower"] = df["Title"].fillna("").str.lower()
+        return df
     except FileNotFoundError:
         st.error(f"File not found: {file_path}. Please ensure 'SB_publication_PMC.csv' is in the directory.")
         st.stop()
@@ -359,45 +293,364 @@ def load_data(file_path):
         st.error(f"Error loading data: {e}")
         st.stop()
 
-@lru_cache(maxsize=128)
+@st.cache_resource
+def get_http_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # One pooled session for the whole server so repeat hosts reuse TCP/TLS connections
+    session = requests.Session()
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    # Pool sized for the executor's workers hitting the same few hosts (PMC/NCBI);
+    # transient throttling/server errors are retried with backoff on the pooled connection
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource
+def get_executor():
+    # Shared pool for I/O-bound work that never waits on Gemini (URL prefetches)
+    return ThreadPoolExecutor(max_workers=8)
+
+@st.cache_resource
+def get_gemini_executor():
+    # Separate pool for jobs that call Gemini (summaries), so time spent queued on the
+    # RPM limiter can't starve fetches; 2x the call cap lets each job's fetch overlap
+    return ThreadPoolExecutor(max_workers=2 * GEMINI_MAX_CONCURRENCY)
+
+@st.cache_resource
+def get_html_parser():
+    # lxml (libxml2, C) when installed; otherwise BeautifulSoup's pure-Python html.parser
+    import importlib.util
+    return "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+def extract_pdf_text(data: bytes):
+    import fitz  # PyMuPDF; imported here so runs without PDFs never load it
+
+    # Stop at the input cap so pages that would be cut anyway are never parsed
+    parts, total, stopped_early = [], 0, False
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for number, page in enumerate(doc, 1):
+            t = page.get_text("text")
+            if not t:
+                continue
+            parts.append(t)
+            total += len(t)
+            if total > MAX_INPUT_CHARS:
+                stopped_early = number < doc.page_count
+                break
+    # Drop the bibliography and collapse layout whitespace; neither helps the summary
+    text, references_found = REFERENCES_HEADING_RE.subn("", "\n".join(parts))
+    text = " ".join(text.split())
+    # Pages skipped after the references heading held no body text, so that doesn't count
+    truncated = (stopped_early and not references_found) or len(text) > MAX_INPUT_CHARS
+    return text[:MAX_INPUT_CHARS] + (TRUNCATED_MARKER if truncated and text else "")
+
+class ContentError(Exception):
+    """
+    An ERROR_* result raised from inside a cached function. st.cache_data does
+    not store exceptions, so failed fetches are retried on the next call instead
+    of being memoized; str(e) is the ERROR_* message shown to the user.
+    """
+
 def fetch_url_text(url: str):
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=20)
-        r.raise_for_status()
+        return _fetch_url_text_cached(url)
+    except ContentError as e:
+        return str(e)
+
+# max_entries bounds only the in-memory layer; persisted entries accumulate in
+# Streamlit's cache directory until it is cleared (deliberate: fetches survive restarts)
+@st.cache_data(persist="disk", max_entries=512, show_spinner=False)
+def _fetch_url_text_cached(url: str):
+    import requests  # only needed on a cache miss
+
+    try:
+        with get_http_session().get(url, timeout=20, stream=True) as r:
+            r.raise_for_status()
+            # Bail before downloading anything if the server already reports an oversized body
+            length = r.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > MAX_DOWNLOAD_BYTES:
+                raise ContentError(f"ERROR_TOO_LARGE: {length} bytes exceeds the {MAX_DOWNLOAD_BYTES} byte limit")
+            content = bytearray()
+            for chunk in r.iter_content(65536):
+                content.extend(chunk)
+                if len(content) > MAX_DOWNLOAD_BYTES:
+                    raise ContentError(f"ERROR_TOO_LARGE: response exceeds the {MAX_DOWNLOAD_BYTES} byte limit")
     except requests.exceptions.RequestException as e:
-        return f"ERROR_FETCH: {e}"
+        raise ContentError(f"ERROR_FETCH: {e}")
 
     content_type = r.headers.get("Content-Type", "").lower()
 
     if "pdf" in content_type or url.lower().endswith(".pdf"):
         try:
-            with io.BytesIO(r.content) as f:
-                reader = PyPDF2.PdfReader(f)
-                return "\n".join(p.extract_text() for p in reader.pages if p.extract_text())
+            return extract_pdf_text(bytes(content))
         except Exception as e:
-            return f"ERROR_PDF_PARSE: {e}"
+            raise ContentError(f"ERROR_PDF_PARSE: {e}")
     else:
         try:
-            soup = BeautifulSoup(r.text, "html.parser")
-            for tag in soup(['script', 'style']): tag.decompose()
+            from bs4 import BeautifulSoup, SoupStrainer
+
+            # lxml is libxml2's C parser; html.parser is pure Python. Only <body> is
+            # built into the tree, and raw bytes are passed so the declared charset is
+            # used directly (the header charset wins when the server sends one).
+            soup = BeautifulSoup(
+                bytes(content[:MAX_HTML_PARSE_BYTES]),
+                get_html_parser(),
+                parse_only=SoupStrainer("body"),
+                from_encoding=r.encoding if "charset" in content_type else None,
+            )
+            for tag in soup(['script', 'style', 'noscript']): tag.decompose()
             # Truncate content for Gemini model context limit
-            return " ".join(soup.body.get_text(separator=" ", strip=True).split())[:25000]
+            text = " ".join((soup.body or soup).get_text(separator=" ", strip=True).split())
+            truncated = len(content) > MAX_HTML_PARSE_BYTES or len(text) > MAX_INPUT_CHARS
+            return text[:MAX_INPUT_CHARS] + (TRUNCATED_MARKER if truncated and text else "")
         except Exception as e:
-            return f"ERROR_HTML_PARSE: {e}"
+            raise ContentError(f"ERROR_HTML_PARSE: {e}")
+
+@st.cache_resource
+def get_prefetch_state():
+    # URLs prefetched in this process (bounded, guarded by the lock), and the slots bounding concurrent prefetches
+    return OrderedDict(), threading.Lock(), threading.Semaphore(PREFETCH_CONCURRENCY)
+
+def prefetch_urls(urls):
+    """
+    Fetches 'urls' in the background so a later click only waits on Gemini.
+    Never blocks the script: once PREFETCH_CONCURRENCY fetches are running,
+    the remaining URLs are skipped until a later rerun. Failed fetches are
+    forgotten so a later rerun can try them again.
+    """
+    seen, lock, slots = get_prefetch_state()
+
+    def finished(future, url):
+        # fetch_url_text reports failures as ERROR_* strings; those aren't cached either
+        failed = future.exception() is not None or future.result().startswith("ERROR")
+        if failed:
+            with lock:
+                seen.pop(url, None)
+        slots.release()
+
+    for url in urls:
+        with lock:
+            if url in seen:
+                continue
+            if not slots.acquire(blocking=False):
+                break
+            seen[url] = None
+            while len(seen) > MAX_PREFETCHED_URLS:
+                seen.popitem(last=False)
+        get_executor().submit(fetch_url_text, url).add_done_callback(lambda f, url=url: finished(f, url))
 
 def summarize_text_with_gemini(text: str):
+    # Strip the marker first so a marker-only result counts as empty, not as content
+    truncated = text.endswith(TRUNCATED_MARKER)
+    if truncated:
+        text = text[:-len(TRUNCATED_MARKER)]
     if not text or text.startswith("ERROR"):
         return f"Could not summarize due to a content error: {text.split(': ')[-1]}"
+    text = text[:MAX_INPUT_CHARS]
+    # Keyed by content, so the same paper reached via different URLs (or uploaded) shares one summary
+    try:
+        return summarize_by_hash(hashlib.blake2b(text.encode(), digest_size=16).hexdigest(), text, truncated)
+    except ContentError as e:
+        return str(e)
 
-    prompt = (f"Summarize this NASA bioscience paper. Output in clean Markdown with a level 3 heading (###) titled 'Key Findings' (using bullet points) and a level 3 heading (###) titled 'Overview Summary' (using a paragraph).\n\nContent:\n{text}")
+def _trim_to_token_budget(text: str):
+    """
+    Cuts 'text' to at most MAX_INPUT_TOKENS as measured by Gemini's tokenizer.
+    Each probe rescales the cut by the measured chars-per-token ratio, so a
+    few count_tokens calls suffice. Any counting error keeps the char-capped text.
+    """
+    # Mostly single-byte (Latin-script) text at the char cap is ~3-4 chars/token and
+    # can't exceed the budget, so the common case skips the count_tokens round trip
+    if len(text) <= MAX_INPUT_TOKENS or len(text.encode()) <= len(text) * 1.1:
+        return text
+    try:
+        model = get_gemini_model()
+        for _ in range(3):
+            with get_gemini_semaphore():
+                tokens = model.count_tokens(text).total_tokens
+            if tokens <= MAX_INPUT_TOKENS:
+                return text
+            text = text[:int(len(text) * MAX_INPUT_TOKENS / tokens * 0.95)]
+        return text
+    except Exception:
+        return text[:MAX_INPUT_CHARS]
+
+# Persisted like the fetch cache (disk entries are not bounded by max_entries). This
+# deliberately retains summaries, including those of uploaded PDFs, across restarts
+# and shares them between sessions with identical text.
+@st.cache_data(persist="disk", max_entries=512, show_spinner=False)
+def summarize_by_hash(text_hash: str, _text: str, truncated: bool = False):
+    # _text is excluded from Streamlit's cache key; text_hash identifies it.
+    # 'truncated' is the extractor's report that the document went on past the text.
+    body = _trim_to_token_budget(_text)
+    truncated = truncated or len(body) < len(_text)
+    prompt = (TRUNCATED_PROMPT_NOTE if truncated else "") + SUMMARIZE_PROMPT_PREFIX + body
+
+    try:
+        return gemini_generate(prompt).text
+    except Exception as e:
+        # Raised, not returned, so a quota/transient failure is not cached
+        raise ContentError(f"ERROR_GEMINI: {e}")
+
+@st.cache_resource
+def prewarm_summaries(file_path: str, count: int = PREWARM_COUNT):
+    """
+    Summarizes the first 'count' publications in the background, once per
+    server process, so those clicks hit the disk cache instead of Gemini.
+    Returns the submitted futures.
+    """
+    links = load_data(file_path)["Link"].dropna().head(count).tolist()
+    return [submit_summary(link) for link in links]
+
+def get_column_labels(lang_choice: str):
+    """
+    Maps dataset column names to display labels in 'lang_choice'. Reuses the
+    cached UI translation bundle, so no extra Gemini call is made; falls back
+    to the English names if translation is unavailable.
+    """
+    if lang_choice == "English":
+        return {}
+    try:
+        _, translated_cols = translate_bundle_via_gemini(tuple(UI_STRINGS_EN.items()), DATASET_COLUMNS, lang_choice)
+        return dict(zip(DATASET_COLUMNS, translated_cols))
+    except Exception:
+        return {}
+
+def summary_key_for(url: str):
+    # Content-addressed by URL: stable across searches and row reordering
+    return "summary_" + hashlib.blake2b(str(url).encode(), digest_size=8).hexdigest()
+
+def store_summary(key: str, value):
+    # Insert as most recently used, evicting the oldest entries past MAX_SESSION_SUMMARIES
+    summaries = st.session_state.summary_dict
+    summaries[key] = value
+    summaries.move_to_end(key)
+    while len(summaries) > MAX_SESSION_SUMMARIES:
+        summaries.popitem(last=False)
+
+# Results that report a failure rather than a summary (see summarize_url / summarize_text_with_gemini)
+SUMMARY_FAILURE_PREFIXES = ("ERROR", "CRITICAL_ERROR", "Could not summarize")
+
+def has_summary(key: str):
+    """
+    True when 'key' holds a finished summary or one still running. Stored
+    failures don't count, so their cards can be summarized again.
+    """
+    value = st.session_state.summary_dict.get(key)
+    return value is not None and not (isinstance(value, str) and value.startswith(SUMMARY_FAILURE_PREFIXES))
 
+def summarize_url(url: str):
+    # Runs on the Gemini executor; errors become strings so the Future never raises
     try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        response = model.generate_content(prompt)
-        return response.text
+        return summarize_text_with_gemini(fetch_url_text(url))
     except Exception as e:
-        return f"ERROR_GEMINI: {e}"
+        return f"CRITICAL_ERROR: {e}"
+
+@st.cache_resource
+def get_inflight_summaries():
+    # URL -> Future for summaries still running, shared by every session
+    return {}, threading.Lock()
+
+def submit_summary(url: str):
+    """
+    Returns the running summary Future for 'url', submitting one only if no
+    session already has it in flight, so double clicks and concurrent users
+    share a single fetch + Gemini call.
+    """
+    inflight, lock = get_inflight_summaries()
+    with lock:
+        future = inflight.get(url)
+        if future is not None:
+            return future
+        future = get_gemini_executor().submit(summarize_url, url)
+        inflight[url] = future
+
+    def forget(done):
+        with lock:
+            if inflight.get(url) is done:
+                del inflight[url]
+
+    # Registered outside the lock: an already-finished future runs the callback inline
+    future.add_done_callback(forget)
+    return future
+
+# Memory only: user uploads are not written to server disk. max_entries bounds it.
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_pdf_text(pdf_hash: str, _data: bytes):
+    # Extracted text keyed by file content, so a retried summary never re-parses the PDF
+    try:
+        return extract_pdf_text(_data)
+    except Exception as e:
+        return f"ERROR_PDF_PARSE: {e}"
+
+def summarize_pdf(pdf_hash: str, data: bytes):
+    # Both steps are cached by content, so re-uploads and renamed copies skip parsing and Gemini
+    return summarize_text_with_gemini(get_pdf_text(pdf_hash, data))
+
+@st.fragment
+def render_result_cards(rows, title_label: str, translated_strings: dict):
+    """
+    Renders one page of result cards with their summarize buttons and summaries.
+    A fragment, so button clicks and the polling for background summaries rerun
+    only the cards rather than the whole page.
+    """
+    # Queue every card on this page without a summary; they fetch and summarize in parallel
+    if st.button(translated_strings.get("summarize_all_button", "🔬 Summarize all on this page"), key="btn_summarize_all"):
+        for _, _, link in rows:
+            if not has_summary(summary_key_for(link)):
+                store_summary(summary_key_for(link), submit_summary(link))
+
+    pending = []
+    for idx, title, link in rows:
+        summary_key = summary_key_for(link)
+
+        with st.container():
+            # Card markup and title go out as one element; escaping keeps titles containing
+            # < or & from breaking it. Not st.html: its sanitizer strips target='_blank'.
+            st.markdown(f"<div class='result-card'><strong>{html.escape(title_label)}:</strong> <a href='{html.escape(str(link))}' target='_blank'>{html.escape(str(title))}</a></div>", unsafe_allow_html=True)
+
+            summary_content = st.session_state.summary_dict.get(summary_key)
+            if summary_content is not None:
+                st.session_state.summary_dict.move_to_end(summary_key)
+
+            # Button for rows without a summary, including failed ones so a transient error can be retried
+            if not has_summary(summary_key):
+                if st.button(translated_strings.get("summarize_button", "🔬 Gather & Summarize"), key=f"btn_summarize_{idx}"):
+                    summary_content = submit_summary(link)
+                    store_summary(summary_key, summary_content)
+
+            if isinstance(summary_content, Future):
+                if summary_content.done():
+                    summary_content = summary_content.result()
+                    store_summary(summary_key, summary_content)
+                else:
+                    pending.append(summary_content)
+                    st.info(f"Accessing and summarizing: {title}...")
+                    summary_content = None
+
+            # DISPLAY SUMMARY IF IT EXISTS FOR THIS PUBLICATION
+            if summary_content is not None:
+                if summary_content.startswith(SUMMARY_FAILURE_PREFIXES):
+                    st.markdown(f"**❌ Failed to Summarize:** *{title}*", unsafe_allow_html=True)
+                    st.error(f"Error fetching/summarizing content: {summary_content}")
+                else:
+                    # Display the summary without an extra box, just the clean markdown
+                    st.markdown(summary_content)
+
+    # Warm the fetch cache for the top results the user has not summarized yet
+    prefetch_urls([link for _, _, link in rows[:PREFETCH_COUNT] if not has_summary(summary_key_for(link))])
+
+    # Poll for finished background summaries so they appear without another click;
+    # the short timeout keeps the script thread free to pick up clicks and edits, and
+    # only this fragment reruns, not the whole page
+    if pending:
+        wait(pending, timeout=SUMMARY_POLL_SECONDS, return_when=FIRST_COMPLETED)
+        st.rerun(scope="fragment")
 
 # --- MAIN PAGE FUNCTION (unchanged except using st.session_state.translated_strings) ---
 def search_page():
@@ -418,27 +671,11 @@ def search_page():
     unsafe_allow_html=True
 )
 
-    # --- Language and PDF Sidebar Setup ---
-    # Sidebar language selector: keep it in sync with top selector
-    def sidebar_lang_changed():
-        # read the sent value and perform translation
-        chosen = st.session_state.get("lang_selector", st.session_state.current_lang)
-        perform_translation(chosen)
-
+    # --- PDF Sidebar Setup ---
+    # Language is chosen only through the top-right selector; a second widget
+    # here would trigger perform_translation twice per change
     with st.sidebar:
         st.markdown("<h3 style='margin: 0; padding: 0;'>Settings ⚙️</h3>", unsafe_allow_html=True)
-        try:
-            index_default_sidebar = list(LANGUAGES.keys()).index(st.session_state.current_lang)
-        except ValueError:
-            index_default_sidebar = 0
-
-        st.session_state.current_lang = st.selectbox(
-            "Select Language:",
-            options=list(LANGUAGES.keys()),
-            index=index_default_sidebar,
-            key="lang_selector",
-            on_change=sidebar_lang_changed
-        )
 
         # --- PDF UPLOAD LOGIC ---
         st.markdown(f"<h3 style='margin: 20px 0 0 0; padding: 0;'>{translated_strings.get('pdf_upload_header', 'Upload PDFs to Summarize')}</h3>", unsafe_allow_html=True)
@@ -463,58 +700,43 @@ def search_page():
 
     search_query = st.text_input(translated_strings.get("search_label", "Search publications..."), placeholder="e.g., microgravity, radiation, Artemis...", label_visibility="collapsed")
 
-    # Load and potentially translate data
+    # Load data
     df = load_data("SB_publication_PMC.csv")
+    prewarm_summaries("SB_publication_PMC.csv")
 
-    # --- Translate Dataset Columns (as requested) ---
-    original_cols = list(df.columns)
-    if st.session_state.current_lang != "English":
-        with st.spinner("Translating dataset columns..."):
-            try:
-                # attempt to translate column names via Gemini; fallback to prefix if fails
-                translated_cols = translate_list_via_gemini(original_cols, st.session_state.current_lang)
-            except Exception:
-                translated_cols = [f"Translated_{item}" for item in original_cols]
-            df.rename(columns=dict(zip(original_cols, translated_cols)), inplace=True)
+    # --- Dataset column labels ---
+    # Columns stay in English internally; only their display labels are translated
+    column_labels = get_column_labels(st.session_state.current_lang)
 
     # --- PDF Summaries Display (outside of the sidebar) ---
     if 'uploaded_files' in locals() and uploaded_files:
         st.markdown("---")
-        for uploaded_file in uploaded_files:
-            # Check if this PDF has already been processed in the current session
-            summary_key = f"pdf_summary_{uploaded_file.name}"
-
-            if summary_key not in st.session_state.summary_dict:
-                pdf_bytes = io.BytesIO(uploaded_file.read())
-                pdf_reader = PyPDF2.PdfReader(pdf_bytes)
-                text = "".join([p.extract_text() or "" for p in pdf_reader.pages])
-
-                with st.spinner(f"Summarizing: {uploaded_file.name} ..."):
-                    summary = summarize_text_with_gemini(text)
-                    st.session_state.summary_dict[summary_key] = summary
-
+        # Key each upload by content hash so renamed duplicates reuse one summary;
+        # getvalue() hands back the upload's buffer without another read/copy
+        uploads = []
+        for f in uploaded_files:
+            data = f.getvalue()
+            uploads.append((f.name, hashlib.sha1(data).hexdigest(), data))
+
+        # Parse and summarize every PDF not yet processed this session in parallel
+        pending = [u for u in uploads if f"pdf_summary_{u[1]}" not in st.session_state.summary_dict]
+        if pending:
+            with st.spinner(f"Summarizing: {', '.join(name for name, _, _ in pending)} ..."):
+                summaries = get_gemini_executor().map(summarize_pdf, [h for _, h, _ in pending], [d for _, _, d in pending])
+                for (_, pdf_hash, _), summary in zip(pending, summaries):
+                    store_summary(f"pdf_summary_{pdf_hash}", summary)
+
+        for name, pdf_hash, _ in uploads:
             # Display the result
-            st.markdown(f"### {translated_strings.get('pdf_summary_title', '📄 Summary: {name}').format(name=uploaded_file.name)}")
-            st.write(st.session_state.summary_dict[summary_key])
+            st.markdown(f"### {translated_strings.get('pdf_summary_title', '📄 Summary: {name}').format(name=name)}")
+            st.write(st.session_state.summary_dict.get(f"pdf_summary_{pdf_hash}", ""))
         st.markdown("---")
 
 
     # --- Search Logic ---
     if search_query:
-        # Use the original (untranslated) 'Title' column for searching if possible
-        # Fallback: try to find any column containing 'Title' case-insensitive
-        search_col_name = None
-        if "Title" in original_cols:
-            search_col_name = "Title"
-        else:
-            title_cols = [c for c in df.columns if 'title' in c.lower()]
-            if title_cols:
-                search_col_name = title_cols[0]
-            else:
-                # fallback to first column
-                search_col_name = df.columns[0]
-
-        mask = df[search_col_name].astype(str).str.contains(search_query, case=False, na=False)
+        # Plain substring match against the cached, pre-lowered titles (no regex engine)
+        mask = df["_title_lower"].str.contains(search_query.lower(), regex=False)
         results_df = df[mask].reset_index(drop=True)
         st.markdown("---")
         st.subheader(translated_strings.get('results_header', "Found {count} matching publications:").format(count=len(results_df)))
@@ -523,50 +745,23 @@ def search_page():
             st.warning(translated_strings.get('no_results', "No matching publications found."))
         else:
             # SINGLE COLUMN DISPLAY LOOP
-            for idx, row in results_df.iterrows():
-                summary_key = f"summary_{idx}"
-
-                with st.container():
-                    st.markdown(f'<div class="result-card">', unsafe_allow_html=True)
-
-                    # Title (Using the potentially translated column name for display)
-                    title_col_name = df.columns[df.columns.str.contains('Title', case=False)].tolist()[0]
-                    link_col_name_candidates = df.columns[df.columns.str.contains('Link', case=False)].tolist()
-                    link_col_name = link_col_name_candidates[0] if link_col_name_candidates else df.columns[2] if len(df.columns) > 2 else df.columns[0]
-
-                    st.markdown(f"**{title_col_name}:** <a href='{row[link_col_name]}' target='_blank'>{row[title_col_name]}</a>", unsafe_allow_html=True)
-
-                    # Button
-                    if st.button(translated_strings.get("summarize_button", "🔬 Gather & Summarize"), key=f"btn_summarize_{idx}"):
-
-                        # GENERATE SUMMARY IMMEDIATELY UPON CLICK
-                        with st.spinner(f"Accessing and summarizing: {row[title_col_name]}..."):
-                            try:
-                                # Must use the ORIGINAL 'Link' column for fetching the URL
-                                text = fetch_url_text(row[original_cols[2]])  # as original code assumed index 2
-                                summary = summarize_text_with_gemini(text)
-                                st.session_state.summary_dict[summary_key] = summary
-                            except Exception as e:
-                                st.session_state.summary_dict[summary_key] = f"CRITICAL_ERROR: {e}"
-
-                        st.experimental_rerun()
-
-                    # DISPLAY SUMMARY IF IT EXISTS FOR THIS PUBLICATION
-                    if summary_key in st.session_state.summary_dict:
-                        summary_content = st.session_state.summary_dict[summary_key]
-
-                        st.markdown('<div class="summary-display">', unsafe_allow_html=True)
-
-                        if summary_content.startswith("ERROR") or summary_content.startswith("CRITICAL_ERROR"):
-                            st.markdown(f"**❌ Failed to Summarize:** *{row[title_col_name]}*", unsafe_allow_html=True)
-                            st.error(f"Error fetching/summarizing content: {summary_content}")
-                        else:
-                            # Display the summary without an extra box, just the clean markdown
-                            st.markdown(summary_content)
-
-                        st.markdown('</div>', unsafe_allow_html=True)
-
-                    st.markdown("</div>", unsafe_allow_html=True)
+            title_col_name, link_col_name = DATASET_COLUMNS
+            title_label = column_labels.get(title_col_name, title_col_name)
+
+            # Render one page of cards at a time so broad queries stay O(page size) per rerun;
+            # a new query (or a page past the end) starts again from page 1
+            page_count = -(-len(results_df) // RESULTS_PAGE_SIZE)
+            if st.session_state.get("results_query") != search_query or st.session_state.get("results_page", 1) > page_count:
+                st.session_state.results_query = search_query
+                st.session_state.results_page = 1
+            page_num = 1
+            if page_count > 1:
+                page_num = st.number_input(translated_strings.get("page_label", "Page"), min_value=1, max_value=page_count, key="results_page")
+            page_df = results_df.iloc[(page_num - 1) * RESULTS_PAGE_SIZE:page_num * RESULTS_PAGE_SIZE]
+
+            rows = list(page_df[[title_col_name, link_col_name]].itertuples(index=True, name=None))
+
+            render_result_cards(rows, title_label, translated_strings)
 
 # --- STREAMLIT PAGE NAVIGATION (unchanged) ---
 pg = st.navigation([